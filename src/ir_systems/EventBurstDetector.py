@@ -0,0 +1,363 @@
+import math
+import heapq
+import random
+import time
+from array import array
+from datetime import datetime, timedelta
+
+from VectorialIRSystem import RankedRetrieval
+
+DELIMITER = "=========================================="
+
+
+def read_articles(file_path):
+    """
+    Stream the articles stored in the database file one at a time.
+
+    Each article is written by the scrapers as a title line, one or more content lines,
+    the publication time, the URL and a delimiter line. The file is read lazily so the
+    corpus never has to fit in memory.
+
+    Args:
+        file_path (str): The path of the database file written by the scrapers.
+
+    Yields:
+        tuple: (title, text, publication_time, url) for each article.
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        block = []
+        for line in file:
+            line = line.strip()
+            if line != DELIMITER:
+                block.append(line)
+                continue
+            # A complete article needs at least a title, the publication time and the URL
+            if len(block) >= 3:
+                title = block[0]
+                text = " ".join(block[1:-2])
+                yield title, text, block[-2], block[-1]
+            block = []
+
+
+def parse_publication_day(publication_time):
+    """
+    Convert the publication time written by the scrapers into a date.
+
+    Args:
+        publication_time (str): The publication time, e.g. '2024-03-01 09:15:00'.
+
+    Returns:
+        date: The publication day, or None if the time is missing or malformed.
+    """
+    try:
+        return datetime.strptime(publication_time[:10], '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def sketch_dimensions(increments, max_error, delta):
+    """
+    Size a count-min sketch from its error bound.
+
+    With width = e * increments / max_error and depth = ln(1 / delta), each estimate exceeds
+    the true count by at most max_error with probability 1 - delta.
+
+    Args:
+        increments (int): Expected total number of increments added to the sketch.
+        max_error (float): Tolerated overestimation of a count.
+        delta (float): Probability of exceeding the tolerated overestimation.
+
+    Returns:
+        tuple: (width, depth) of the sketch.
+    """
+    width = math.ceil(math.e * increments / max_error)
+    depth = math.ceil(math.log(1 / delta))
+    return width, depth
+
+
+class CountMinSketch:
+    def __init__(self, width=2048, depth=4, seeds=None):
+        # Fixed-size counter table, one row per hash function
+        self.width = width
+        self.depth = depth
+        self.seeds = seeds if seeds is not None else [random.getrandbits(32) for _ in range(depth)]
+        self.table = [array('I', [0]) * width for _ in range(depth)]
+
+    def add(self, term, count=1):
+        """
+        Increment the counts of a term with a conservative update: only the counters below the
+        new estimate are raised, which reduces the overestimation caused by collisions.
+
+        Args:
+            term (str): The term to count.
+            count (int): The amount to add.
+
+        Returns:
+            int: The new estimate of the count of the term.
+        """
+        positions = [hash((seed, term)) % self.width for seed in self.seeds]
+        estimate = min(row[position] for row, position in zip(self.table, positions)) + count
+        for row, position in zip(self.table, positions):
+            if row[position] < estimate:
+                row[position] = estimate
+        return estimate
+
+    def estimate(self, term):
+        """
+        Estimate the count of a term. The estimate never underestimates the true count.
+
+        Args:
+            term (str): The term to look up.
+
+        Returns:
+            int: The smallest counter of the term across all rows.
+        """
+        return min(row[hash((seed, term)) % self.width] for row, seed in zip(self.table, self.seeds))
+
+
+def burst_score(count, expected):
+    """
+    Score how far an observed count bursts above the count expected from a baseline.
+
+    Args:
+        count (int): Number of articles containing the term on a day.
+        expected (float): Number of articles expected to contain it from the baseline rate.
+
+    Returns:
+        float: The excess over the expected count, scaled by the square root of the expected count.
+    """
+    return (count - expected) / math.sqrt(expected + 1)
+
+
+class DayBucket:
+    def __init__(self, width, depth, seeds, top_k):
+        # Per-day term counts (sketch), number of articles and top-k burst candidates
+        self.sketch = CountMinSketch(width, depth, seeds)
+        self.num_articles = 0
+        self.top_k = top_k
+        self.heavy_hitters = {}
+        self.counts = {}
+        self.heap = []
+        self.scored = False
+
+    def add_terms(self, terms, totals, total_articles):
+        """
+        Count each term once for a new article and update the burst candidates.
+
+        Candidates are ranked by their burst score against the rate of the term on the other
+        days seen so far, so common words that appear every day do not crowd them out. Their
+        counts are kept exactly from the moment they become candidates, so collisions in the
+        sketch never inflate the counts that are scored.
+
+        Args:
+            terms (set): The distinct terms of the article.
+            totals (CountMinSketch): Term counts over the whole stream, also updated here.
+            total_articles (int): Number of articles in the whole stream, including this one.
+        """
+        self.num_articles += 1
+        other_articles = total_articles - self.num_articles
+        for term in terms:
+            estimate = self.sketch.add(term)
+            total_estimate = totals.add(term)
+            if term in self.counts:
+                self.counts[term] += 1
+            expected = 0.0
+            if other_articles > 0:
+                expected = max(total_estimate - estimate, 0) / other_articles * self.num_articles
+            score = burst_score(self.counts.get(term, estimate), expected)
+
+            if term in self.heavy_hitters or len(self.heavy_hitters) < self.top_k:
+                self.counts.setdefault(term, 1)
+                self.heavy_hitters[term] = score
+                heapq.heappush(self.heap, (score, term))
+            else:
+                # Discard stale heap entries until the top matches the current candidates
+                while self.heap[0][1] not in self.heavy_hitters or self.heap[0][0] != self.heavy_hitters[self.heap[0][1]]:
+                    heapq.heappop(self.heap)
+                if score > self.heap[0][0]:
+                    _, evicted = heapq.heappop(self.heap)
+                    del self.heavy_hitters[evicted]
+                    del self.counts[evicted]
+                    self.heavy_hitters[term] = score
+                    self.counts[term] = 1
+                    heapq.heappush(self.heap, (score, term))
+
+        # Keep the lazy heap bounded by rebuilding it from the current candidates
+        if len(self.heap) > 4 * self.top_k:
+            self.heap = [(score, term) for term, score in self.heavy_hitters.items()]
+            heapq.heapify(self.heap)
+
+
+class EventBurstDetector:
+    def __init__(self, retrieval=None, window=7, min_history=3, daily_terms=100000, max_error=8,
+                 delta=0.05, top_k=50, max_days=None, threshold=5.0, min_count=3):
+        """
+        Args:
+            retrieval (RankedRetrieval): Provides the tokenizer.
+            window (int): Number of previous days used as the baseline of a day.
+            min_history (int): Minimum number of previous days with articles needed for a baseline.
+                Days with less history use the rate of the term over the rest of the stream.
+            daily_terms (int): Expected number of (article, distinct term) pairs per day, used to
+                size the daily count-min sketches.
+            max_error (float): Tolerated overestimation of a daily count by the sketches.
+            delta (float): Probability of exceeding the tolerated overestimation.
+            top_k (int): Number of burst candidates tracked per day.
+            max_days (int): If set, at most this many days (the most recent ones) are kept in memory.
+                It must be larger than window. The oldest day is evicted when a newer one arrives,
+                after scoring it and the days that use it as baseline; articles older than all the
+                kept days are dropped. Articles may arrive in any order, but a day that is already
+                scored is not scored again.
+            threshold (float): Minimum burst score for a term to be flagged. Thousands of terms
+                are tested every day, so it is well above the usual 2 or 3 standard deviations.
+            min_count (int): Minimum number of articles containing the term on that day.
+        """
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        if max_days is not None and max_days <= window:
+            raise ValueError("max_days must be larger than window")
+        self.retrieval = retrieval if retrieval is not None else RankedRetrieval()
+        self.window = window
+        self.min_history = min_history
+        self.width, self.depth = sketch_dimensions(daily_terms, max_error, delta)
+        self.top_k = top_k
+        self.max_days = max_days
+        self.threshold = threshold
+        self.min_count = min_count
+        self.seeds = [random.getrandbits(32) for _ in range(self.depth)]
+        self.totals = CountMinSketch(self.width, self.depth, self.seeds)
+        self.buckets = {}
+        self.bursts = []
+        self.num_articles = 0
+        self.num_skipped = 0
+
+    def add_article(self, title, text, publication_time):
+        """
+        Count the terms of an article in the bucket of its publication day.
+
+        Args:
+            title (str): The title of the article.
+            text (str): The text content of the article.
+            publication_time (str): The publication time written by the scrapers.
+        """
+        day = parse_publication_day(publication_time)
+        if day is None or (day not in self.buckets and self.max_days is not None
+                           and len(self.buckets) >= self.max_days and day < min(self.buckets)):
+            self.num_skipped += 1
+            return
+
+        if day not in self.buckets:
+            self.buckets[day] = DayBucket(self.width, self.depth, self.seeds, self.top_k)
+            if self.max_days is not None and len(self.buckets) > self.max_days:
+                self.evict_day(min(self.buckets), day)
+        # Terms are counted once per article, like the document frequency
+        terms = set(self.retrieval.tokenize(title + " " + text))
+        self.num_articles += 1
+        self.buckets[day].add_terms(terms, self.totals, self.num_articles)
+
+    def evict_day(self, oldest_day, new_day):
+        """
+        Score the oldest day and the days that use it as baseline, then evict it.
+
+        Args:
+            oldest_day (date): The oldest day kept in memory.
+            new_day (date): The day whose first article caused the eviction; it is not scored yet.
+        """
+        last_day = oldest_day + timedelta(days=self.window)
+        for day in sorted(self.buckets):
+            if day <= last_day and day != new_day and not self.buckets[day].scored:
+                self.score_day(day)
+        del self.buckets[oldest_day]
+
+    def get_baseline_rate(self, term, day):
+        """
+        Estimate the fraction of articles containing a term before a given day.
+
+        Args:
+            term (str): The term to look up.
+            day (date): The day whose baseline is computed.
+
+        Returns:
+            float: The baseline rate, or None if no other article has been seen.
+        """
+        rates = []
+        for offset in range(1, self.window + 1):
+            bucket = self.buckets.get(day - timedelta(days=offset))
+            if bucket is not None and bucket.num_articles > 0:
+                rates.append(bucket.sketch.estimate(term) / bucket.num_articles)
+        if len(rates) >= self.min_history:
+            return sum(rates) / len(rates)
+
+        # Not enough previous days in the window: fall back to the document frequency of the
+        # term over the rest of the stream
+        bucket = self.buckets[day]
+        other_articles = self.num_articles - bucket.num_articles
+        if other_articles > 0:
+            return max(self.totals.estimate(term) - bucket.sketch.estimate(term), 0) / other_articles
+        return None
+
+    def score_day(self, day):
+        """
+        Flag the burst candidates of a day whose frequency bursts against their baseline
+        and store them in self.bursts.
+
+        Args:
+            day (date): The day to score.
+        """
+        bucket = self.buckets[day]
+        day_bursts = []
+        for term, count in bucket.counts.items():
+            if count < self.min_count:
+                continue
+            rate = self.get_baseline_rate(term, day)
+            if rate is None:
+                continue
+            expected = rate * bucket.num_articles
+            score = burst_score(count, expected)
+            if score >= self.threshold:
+                day_bursts.append((day, term, count, expected, score))
+        day_bursts.sort(key=lambda x: x[4], reverse=True)
+        self.bursts.extend(day_bursts)
+        bucket.scored = True
+
+    def detect_bursts(self):
+        """
+        Score the days still in memory at the end of the stream and return all the bursts found.
+
+        Returns:
+            list: (day, term, count, expected, score) tuples sorted by day and descending score.
+        """
+        for day in sorted(self.buckets):
+            if not self.buckets[day].scored:
+                self.score_day(day)
+        return sorted(self.bursts, key=lambda x: (x[0], -x[4]))
+
+
+def main():
+    file_path = "data/database.txt"
+
+    # Keep at most 90 days in memory; older days are scored and evicted
+    detector = EventBurstDetector(max_days=90)
+
+    # Process the article stream in a single pass
+    start_time = time.time()
+    for title, text, publication_time, _ in read_articles(file_path):
+        detector.add_article(title, text, publication_time)
+    execution_time = time.time() - start_time
+
+    print("Articles processed:", detector.num_articles, "( skipped:", detector.num_skipped, ")")
+    print("Processing time:", execution_time, "seconds")
+    if execution_time > 0:
+        print("Throughput:", detector.num_articles / execution_time, "articles/sec")
+
+    # Report the bursting terms of each day
+    current_day = None
+    for day, term, count, expected, score in detector.detect_bursts():
+        if day != current_day:
+            print()
+            print("Day:", day)
+            current_day = day
+        print(f"  {term}: {count} articles (expected {expected:.1f}, score {score:.2f})")
+
+
+if __name__ == "__main__":
+    main()
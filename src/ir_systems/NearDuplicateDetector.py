@@ -0,0 +1,165 @@
+from array import array
+
+# Shingles are hashed to 56 bits so densified signature values still fit in 64 bits
+HASH_MASK = (1 << 56) - 1
+
+
+class NearDuplicateDetector:
+    def __init__(self, retrieval, num_perm=128, bands=16, shingle_size=5, threshold=0.8):
+        """
+        Args:
+            retrieval (RankedRetrieval): Provides the tokenizer used to build the shingles.
+            num_perm (int): Number of MinHash values in each signature.
+            bands (int): Number of LSH bands; num_perm must be divisible by it.
+            shingle_size (int): Number of consecutive words in each shingle.
+            threshold (float): Minimum estimated Jaccard similarity to treat two articles as duplicates.
+        """
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        self.retrieval = retrieval
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.offset = (HASH_MASK // num_perm) + 1
+        # One dictionary per band mapping a band of the signature to the articles sharing it
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}
+        self.urls = {}
+        self.representative = {}
+
+    def get_shingles(self, title, text):
+        """
+        Build the set of word shingles of an article.
+
+        Args:
+            title (str): The title of the article.
+            text (str): The text content of the article.
+
+        Returns:
+            set: The shingles (tuples of consecutive tokens) of the article, empty if it has fewer
+            than shingle_size tokens.
+        """
+        tokens = self.retrieval.tokenize(title + " " + text)
+        return {tuple(tokens[i:i + self.shingle_size]) for i in range(len(tokens) - self.shingle_size + 1)}
+
+    def get_signature(self, shingles):
+        """
+        Compute the MinHash signature of a set of shingles.
+
+        One-permutation hashing is used: each shingle is hashed once, the hash selects a bin
+        and each bin keeps its minimum value. Empty bins borrow the value of the next non-empty
+        bin, shifted by the distance, so that every signature has num_perm values.
+
+        Args:
+            shingles (set): The shingles of the article.
+
+        Returns:
+            array: The signature of the article.
+        """
+        bins = [None] * self.num_perm
+        for shingle in shingles:
+            h = hash(shingle) & HASH_MASK
+            b = h % self.num_perm
+            value = h // self.num_perm
+            if bins[b] is None or value < bins[b]:
+                bins[b] = value
+
+        # Densify the empty bins by rotation
+        signature = array('Q', bins if None not in bins else [0] * self.num_perm)
+        if None in bins:
+            for b in range(self.num_perm):
+                distance = 0
+                while bins[(b + distance) % self.num_perm] is None:
+                    distance += 1
+                signature[b] = bins[(b + distance) % self.num_perm] + distance * self.offset
+        return signature
+
+    def estimate_similarity(self, signature, other_signature):
+        """
+        Estimate the Jaccard similarity of two articles from their signatures.
+
+        Args:
+            signature (array): The signature of the first article.
+            other_signature (array): The signature of the second article.
+
+        Returns:
+            float: The fraction of equal signature values.
+        """
+        matches = sum(1 for a, b in zip(signature, other_signature) if a == b)
+        return matches / self.num_perm
+
+    def add_document(self, title, text, doc_id, url=None):
+        """
+        Check an article against the previously added ones and register it.
+
+        Only the first article of each group of duplicates is stored in the LSH index, so
+        memory and lookups grow with the number of distinct articles.
+
+        Args:
+            title (str): The title of the article.
+            text (str): The text content of the article.
+            doc_id (int): The unique identifier of the article.
+            url (str): The URL of the article, used to catch the same page scraped twice.
+
+        Returns:
+            int: The ID of the article this one duplicates, or doc_id if it is new.
+        """
+        # The same URL re-ingested from another section is an exact duplicate
+        if url and url in self.urls:
+            self.representative[doc_id] = self.urls[url]
+            return self.urls[url]
+
+        shingles = self.get_shingles(title, text)
+        if not shingles:
+            # Articles too short to shingle (e.g. a headline with an empty body when the scraper
+            # found no paragraphs) are never considered duplicates
+            self.representative[doc_id] = doc_id
+            return doc_id
+        signature = self.get_signature(shingles)
+        band_keys = [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+        # Candidates are the articles sharing at least one band
+        candidates = set()
+        for band, key in zip(self.buckets, band_keys):
+            candidates.update(band.get(key, []))
+
+        best_id, best_similarity = None, 0.0
+        for candidate in candidates:
+            similarity = self.estimate_similarity(signature, self.signatures[candidate])
+            if similarity > best_similarity:
+                best_id, best_similarity = candidate, similarity
+        if best_id is not None and best_similarity >= self.threshold:
+            self.representative[doc_id] = best_id
+            return best_id
+
+        # New article: index its bands and keep its signature for future checks
+        for band, key in zip(self.buckets, band_keys):
+            if key not in band:
+                band[key] = []
+            band[key].append(doc_id)
+        self.signatures[doc_id] = signature
+        if url:
+            self.urls[url] = doc_id
+        self.representative[doc_id] = doc_id
+        return doc_id
+
+    def collapse_results(self, results):
+        """
+        Keep only the best ranked article of each group of duplicates.
+
+        Args:
+            results (list): (doc_id, score) pairs sorted by descending score.
+
+        Returns:
+            list: The results without the lower ranked duplicates.
+        """
+        seen = set()
+        collapsed = []
+        for doc_id, score in results:
+            representative = self.representative.get(doc_id, doc_id)
+            if representative not in seen:
+                seen.add(representative)
+                collapsed.append((doc_id, score))
+        return collapsed
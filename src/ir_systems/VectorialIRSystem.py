@@ -2,6 +2,8 @@ import re
 import math 
 import time
 
+from NearDuplicateDetector import NearDuplicateDetector
+
 class RankedRetrieval:
     def __init__(self):
         # Initialize index, document frequency, weights, idf, and max_doc_id attributes
@@ -173,52 +175,86 @@ class RankedRetrieval:
         return similarity_scores
 
 
-# Start time
-start_time = time.time()
-
-# Initialize an empty list to store documents
-documents = []
-
-# Initialize a RankedRetrieval object
-retrieval = RankedRetrieval()
-file_path = r"data\database.txt"
-
-
-# Read documents from a file
-with open(file_path, "r", encoding="utf-8") as file:
-    lines = file.readlines()
-    num_lines = len(lines)
-    i = 0
-    doc_id = 0
-    url = ""
-    while i < num_lines:
-        # Find the delimiter "================="
-        while i < num_lines and lines[i].strip() != "==========================================":
-            i += 1
-        i += 1  # Skip the delimiter line
-        
-        # Check if there are more lines to process
-        if i < num_lines:
-            # Extract document components until the next delimiter
-            title = lines[i].strip()
-            i += 1
-            text = ""
+def load_documents(file_path, retrieval, duplicates=None, deduplication=None):
+    """
+    Read the documents from the database file and add them to the inverted index.
+
+    Args:
+        file_path (str): The path of the database file written by the scrapers.
+        retrieval (RankedRetrieval): The retrieval system whose index is built.
+        duplicates (NearDuplicateDetector): Detects near-duplicate documents, if given.
+        deduplication (str): "index" to skip the near-duplicates instead of indexing them.
+
+    Returns:
+        tuple: The list of (title, text, url) documents, indexed by doc_id, and the number of
+        near-duplicate documents found.
+    """
+    documents = []
+    num_duplicates = 0
+
+    # Read documents from a file
+    with open(file_path, "r", encoding="utf-8") as file:
+        lines = file.readlines()
+        num_lines = len(lines)
+        i = 0
+        doc_id = 0
+        article_id = 0  # Counts every article read, including the duplicates skipped when indexing
+        url = ""
+        while i < num_lines:
+            # Find the delimiter "================="
             while i < num_lines and lines[i].strip() != "==========================================":
-                if lines[i+1].strip() == "==========================================":
-                    url = lines[i].strip()
-                    #print(lines[i])
-                else: 
-                    text += lines[i].strip() + " "
                 i += 1
-            
-            # Add document components to the documents list
-            documents.append((title, text, url))
-            # Add document to the inverted index
-            retrieval.get_tf(title, text, doc_id)
-            doc_id += 1
+            i += 1  # Skip the delimiter line
 
-    retrieval.max_doc_id = doc_id # store number of documents, note that the number of documents is the id of the last document + 1, which is done above
-    retrieval.get_idf()
+            # Check if there are more lines to process
+            if i < num_lines:
+                # Extract document components until the next delimiter
+                title = lines[i].strip()
+                i += 1
+                text = ""
+                while i < num_lines and lines[i].strip() != "==========================================":
+                    if lines[i+1].strip() == "==========================================":
+                        url = lines[i].strip()
+                        #print(lines[i])
+                    else: 
+                        text += lines[i].strip() + " "
+                    i += 1
+
+                # Check whether the document duplicates a previous one. Duplicates are identified by
+                # article_id; it equals doc_id in "result" mode, where no document is skipped
+                is_duplicate = duplicates is not None and duplicates.add_document(title, text, article_id, url) != article_id
+                article_id += 1
+                if is_duplicate:
+                    num_duplicates += 1
+                    if deduplication == "index":
+                        continue  # Skipped documents get no doc_id, keeping documents and doc_id in sync
+
+                # Add document components to the documents list
+                documents.append((title, text, url))
+                # Add document to the inverted index
+                retrieval.get_tf(title, text, doc_id)
+                doc_id += 1
+
+        retrieval.max_doc_id = doc_id # store number of documents, note that the number of documents is the id of the last document + 1, which is done above
+        retrieval.get_idf()
+
+    return documents, num_duplicates
+
+
+def main():
+    # Start time
+    start_time = time.time()
+
+    # Initialize a RankedRetrieval object
+    retrieval = RankedRetrieval()
+    file_path = r"data\database.txt"
+
+    # Near-duplicate handling: None, "index" (skip duplicates when indexing) or "result" (collapse them in the ranking)
+    deduplication = None
+    duplicates = NearDuplicateDetector(retrieval) if deduplication else None
+
+    # Read documents from a file and build the inverted index
+    documents, num_duplicates = load_documents(file_path, retrieval, duplicates, deduplication)
 
     # End time
     end_time = time.time()
@@ -226,6 +262,8 @@ with open(file_path, "r", encoding="utf-8") as file:
     execution_time = end_time - start_time
 
     print("Pre-processing time:", execution_time, "seconds")
+    if duplicates is not None:
+        print("Near-duplicate documents found:", num_duplicates)
 
 
 
@@ -247,6 +285,10 @@ with open(file_path, "r", encoding="utf-8") as file:
     # Sort the dictionary items based on values (similarity scores)
     results = sorted(results.items(), key=lambda x: x[1], reverse=True)
 
+    # Keep only the best ranked document of each group of near-duplicates
+    if deduplication == "result":
+        results = duplicates.collapse_results(results)
+
     retrieval_end_time = time.time()
     retrieval_time = retrieval_end_time - retrieval_start_time
 
@@ -261,3 +303,6 @@ with open(file_path, "r", encoding="utf-8") as file:
         i += 1
             # End time
 
+
+if __name__ == "__main__":
+    main()
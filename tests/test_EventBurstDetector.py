@@ -0,0 +1,137 @@
+import bisect
+import itertools
+import os
+import random
+import sys
+from collections import Counter
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "ir_systems"))
+
+from EventBurstDetector import CountMinSketch, EventBurstDetector  # noqa: E402
+
+COMMON_WORDS = ["the", "of", "said", "and", "to", "in", "korea", "government"]
+VOCABULARY = [f"word{i}" for i in range(500)]
+
+
+def generate_stream(num_days, articles_per_day, burst_day, burst_term="earthquake", burst_fraction=0.25, seed=0):
+    # Every article contains the common words and a random sample of mid-frequency words
+    rng = random.Random(seed)
+    for day in range(1, num_days + 1):
+        for a in range(articles_per_day):
+            words = COMMON_WORDS + rng.sample(VOCABULARY, 40)
+            if day == burst_day and a < articles_per_day * burst_fraction:
+                words.append(burst_term)
+            yield f"Title {a}", " ".join(words), f"2024-03-{day:02d} 10:00:00"
+
+
+def generate_zipf_stream(num_days, articles_per_day, words_per_article, vocabulary_size, burst_articles):
+    # Words drawn from a Zipf distribution over a large vocabulary; the burst is on the last day
+    rng = random.Random(0)
+    cumulative = list(itertools.accumulate(1 / rank for rank in range(1, vocabulary_size + 1)))
+    for day in range(1, num_days + 1):
+        for a in range(articles_per_day):
+            words = [f"term{bisect.bisect(cumulative, rng.random() * cumulative[-1])}"
+                     for _ in range(words_per_article)]
+            if day == num_days and a < burst_articles:
+                words.append("earthquake")
+            yield f"Title {a}", " ".join(words), f"2024-03-{day:02d} 10:00:00"
+
+
+def flagged_terms(bursts, day):
+    return {term for burst_day, term, _, _, _ in bursts if burst_day.day == day}
+
+
+def test_new_mid_frequency_term_is_flagged():
+    detector = EventBurstDetector()
+    for title, text, publication_time in generate_stream(10, 100, burst_day=10):
+        detector.add_article(title, text, publication_time)
+
+    assert "earthquake" in detector.buckets[max(detector.buckets)].heavy_hitters
+    bursts = detector.detect_bursts()
+    assert "earthquake" in flagged_terms(bursts, 10)
+    assert not flagged_terms(bursts, 10) & set(COMMON_WORDS)
+
+
+def test_no_false_positives_with_realistic_vocabulary():
+    detector = EventBurstDetector()
+    for title, text, publication_time in generate_zipf_stream(8, 200, 300, 50000, burst_articles=20):
+        detector.add_article(title, text, publication_time)
+
+    bursts = detector.detect_bursts()
+    assert [(day.day, term, count) for day, term, count, _, _ in bursts] == [(8, "earthquake", 20)]
+
+
+def test_max_days_keeps_bursts_of_evicted_days():
+    detector = EventBurstDetector(window=3, max_days=4)
+    for title, text, publication_time in generate_stream(10, 100, burst_day=5):
+        detector.add_article(title, text, publication_time)
+        assert len(detector.buckets) <= detector.max_days
+
+    # Day 5 was scored before its bucket was evicted
+    assert min(detector.buckets).day > 5
+    assert "earthquake" in flagged_terms(detector.bursts, 5)
+    assert "earthquake" in flagged_terms(detector.detect_bursts(), 5)
+
+
+def test_max_days_with_newest_first_sections():
+    # The scrapers write each section newest-first, one section after the other
+    detector = EventBurstDetector(window=3, max_days=10)
+    for section in range(3):
+        articles = list(generate_stream(8, 40, burst_day=6, seed=section))
+        for title, text, publication_time in reversed(articles):
+            detector.add_article(title, text, publication_time)
+            assert len(detector.buckets) <= detector.max_days
+
+    assert detector.num_skipped == 0
+    assert flagged_terms(detector.detect_bursts(), 6) == {"earthquake"}
+
+
+def test_baseline_falls_back_to_rest_of_stream():
+    # With a single previous day, the baseline is the rate of the term over the rest of the stream
+    detector = EventBurstDetector(min_history=3)
+    for day, present in ((1, 20), (2, 80)):
+        for a in range(100):
+            text = "festival" if a < present else "weather"
+            detector.add_article(f"Title {a}", text, f"2024-03-{day:02d} 10:00:00")
+
+    assert detector.get_baseline_rate("festival", min(detector.buckets)) == pytest.approx(0.8, abs=0.01)
+    bursts = detector.detect_bursts()
+    assert flagged_terms(bursts, 2) == {"festival"}
+    _, _, count, expected, _ = next(burst for burst in bursts if burst[0].day == 2)
+    assert count == 80
+    assert expected == pytest.approx(20, abs=1)
+
+
+def test_heavy_hitters_match_lazy_heap():
+    detector = EventBurstDetector(top_k=5)
+    true_counts = {}
+    for title, text, publication_time in generate_stream(4, 50, burst_day=4):
+        detector.add_article(title, text, publication_time)
+        day_counts = true_counts.setdefault(publication_time[:10], Counter())
+        day_counts.update(set(detector.retrieval.tokenize(title + " " + text)))
+        for day, bucket in detector.buckets.items():
+            assert len(bucket.heavy_hitters) <= bucket.top_k
+            assert len(bucket.heap) <= 4 * bucket.top_k
+            assert bucket.counts.keys() == bucket.heavy_hitters.keys()
+            entries = set(bucket.heap)
+            assert all((score, term) in entries for term, score in bucket.heavy_hitters.items())
+            # Candidate counts are exact since admission, so they never exceed the true counts
+            assert all(count <= true_counts[str(day)][term] for term, count in bucket.counts.items())
+
+
+def test_sketch_never_underestimates():
+    rng = random.Random(1)
+    sketch = CountMinSketch(width=64, depth=3)
+    counts = Counter(rng.choice(VOCABULARY) for _ in range(5000))
+    for term, count in counts.items():
+        sketch.add(term, count)
+    assert all(sketch.estimate(term) >= count for term, count in counts.items())
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        EventBurstDetector(top_k=0)
+    with pytest.raises(ValueError):
+        EventBurstDetector(window=7, max_days=7)
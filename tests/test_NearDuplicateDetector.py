@@ -0,0 +1,108 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "ir_systems"))
+
+from NearDuplicateDetector import NearDuplicateDetector  # noqa: E402
+from VectorialIRSystem import RankedRetrieval, load_documents  # noqa: E402
+
+DELIMITER = "=========================================="
+VOCABULARY = [f"word{i}" for i in range(2000)]
+
+
+def make_article(seed, length=300):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(VOCABULARY) for _ in range(length))
+
+
+def write_database(path, articles):
+    # Same layout as the scrapers; the IR systems skip everything before the first delimiter
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(DELIMITER + "\n")
+        for title, text, url in articles:
+            file.write(f"{title}\n{text}\n2024-03-01 10:00:00\n{url}\n{DELIMITER}\n")
+
+
+def test_near_duplicates_map_to_first_article():
+    detector = NearDuplicateDetector(RankedRetrieval())
+    text = make_article(0)
+    edited = text.split()
+    edited[100] = "changed"
+
+    assert detector.add_document("Story", text, 0, "https://a/0") == 0
+    assert detector.add_document("Story", " ".join(edited), 1, "https://a/1") == 0
+    assert detector.add_document("Story", "SEOUL (Yonhap) -- " + text, 2, "https://b/2") == 0
+    assert detector.add_document("Other story", make_article(1), 3, "https://a/3") == 3
+
+
+def test_repeated_url_is_a_duplicate():
+    detector = NearDuplicateDetector(RankedRetrieval())
+    assert detector.add_document("Story", make_article(0), 0, "https://a/0") == 0
+    # The same page scraped from another section, even if its text was extracted differently
+    assert detector.add_document("Story", make_article(1), 1, "https://a/0") == 0
+
+
+def test_short_articles_are_never_duplicates():
+    detector = NearDuplicateDetector(RankedRetrieval())
+    assert detector.add_document("a", "", 5) == 5
+    assert detector.add_document("a", "", 6) == 6
+    assert detector.add_document("Same short headline", "", 7) == 7
+    assert detector.add_document("Same short headline", "", 8) == 8
+
+
+def test_collapse_results_keeps_best_ranked_member():
+    detector = NearDuplicateDetector(RankedRetrieval())
+    text = make_article(0)
+    detector.add_document("Story", text, 0)
+    detector.add_document("Other story", make_article(1), 1)
+    detector.add_document("Story (Yonhap)", text + " yonhap", 2)
+
+    results = [(2, 0.9), (1, 0.5), (0, 0.4)]
+    assert detector.collapse_results(results) == [(2, 0.9), (1, 0.5)]
+
+
+def test_index_mode_skips_duplicates_and_keeps_doc_ids_in_sync(tmp_path):
+    text = make_article(0)
+    articles = [
+        ("Story", text, "https://a/0"),
+        ("Story (Yonhap)", "SEOUL (Yonhap) -- " + text, "https://b/1"),
+        ("Other story", make_article(1), "https://a/2"),
+        ("Story", text, "https://a/0"),
+        ("Third story", make_article(2), "https://a/4"),
+    ]
+    file_path = tmp_path / "database.txt"
+    write_database(file_path, articles)
+
+    retrieval = RankedRetrieval()
+    duplicates = NearDuplicateDetector(retrieval)
+    documents, num_duplicates = load_documents(file_path, retrieval, duplicates, "index")
+
+    assert num_duplicates == 2
+    assert [title for title, _, _ in documents] == ["Story", "Other story", "Third story"]
+    assert retrieval.max_doc_id == 3
+    # Each doc_id in the index points at the matching document
+    assert {doc_id for doc_id, _ in retrieval.doc_frequency["story"]} == {0, 1, 2}
+    assert {doc_id for doc_id, _ in retrieval.doc_frequency["third"]} == {2}
+    # The detector numbers every article read, including the skipped ones
+    assert duplicates.representative == {0: 0, 1: 0, 2: 2, 3: 0, 4: 4}
+
+
+def test_result_mode_indexes_every_document(tmp_path):
+    text = make_article(0)
+    articles = [
+        ("Story", text, "https://a/0"),
+        ("Story (Yonhap)", "SEOUL (Yonhap) -- " + text, "https://b/1"),
+        ("Other story", make_article(1), "https://a/2"),
+    ]
+    file_path = tmp_path / "database.txt"
+    write_database(file_path, articles)
+
+    retrieval = RankedRetrieval()
+    duplicates = NearDuplicateDetector(retrieval)
+    documents, num_duplicates = load_documents(file_path, retrieval, duplicates, "result")
+
+    assert num_duplicates == 1
+    assert len(documents) == retrieval.max_doc_id == 3
+    results = [(1, 0.9), (0, 0.8), (2, 0.1)]
+    assert duplicates.collapse_results(results) == [(1, 0.9), (2, 0.1)]